@@ -7,47 +7,327 @@ Replaces Jekyll functionality with Python-based static site generation
 import os
 import csv
 import json
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import pickle
+import tempfile
+import threading
+import hashlib
+import gzip
+import mimetypes
+from array import array
+from datetime import datetime, timezone
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_frozen import Freezer
 import markdown
 import frontmatter
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to Flask's stdlib json provider
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip is offered without it
+    brotli = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # Optional: fall back to csv.DictReader
+    pa = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib encoder"""
+    
+    def _options(self, indent=False, sort_keys=None):
+        # Dates go through self.default, so they stay HTTP dates as with the
+        # stdlib provider (orjson would emit RFC 3339)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop('indent', None)
+        sort_keys = kwargs.pop('sort_keys', None)
+        if kwargs or indent not in (None, 2):
+            # Options orjson can't express: use the stdlib encoder
+            if sort_keys is not None:
+                kwargs['sort_keys'] = sort_keys
+            return super().dumps(obj, indent=indent, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options(indent, sort_keys)).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['FREEZER_RELATIVE_URLS'] = True
 freezer = Freezer(app)
 
-# Global data storage
-prompts_data = []
-vibe_prompts_data = []
+# Bump whenever the shape of the cached rows changes, so old caches are ignored
+PICKLE_CACHE_VERSION = 1
+
+def _pickle_cache_path(path):
+    """Return the path of the pickled parse cache for a CSV file"""
+    return Path(path).with_suffix('.pkl')
+
+def _read_pickle_cache(path, mtime_ns, size):
+    """Return rows from the pickle cache if it is at least as new as the CSV"""
+    cache_path = _pickle_cache_path(path)
+    try:
+        if cache_path.stat().st_mtime_ns < mtime_ns:
+            return None
+        with open(cache_path, 'rb') as file:
+            cached = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if (not isinstance(cached, dict) or cached.get('version') != PICKLE_CACHE_VERSION
+            or cached.get('size') != size):
+        return None
+    return cached.get('rows')
+
+def _write_pickle_cache(path, size, rows):
+    """Write parsed rows next to the CSV file, ignoring unwritable locations"""
+    cache_path = _pickle_cache_path(path)
+    cached = {'version': PICKLE_CACHE_VERSION, 'size': size, 'rows': rows}
+    try:
+        # A unique temp file per writer, so concurrent processes don't clobber
+        # each other's half-written cache before the atomic replace
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name + '.', suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def _parse_csv_pyarrow(path):
+    """Parse a CSV file with pyarrow's C++ reader, keeping every column as text"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        header = next(csv.reader(file), [])
+    if not header:
+        return ()
+    
+    table = pa_csv.read_csv(
+        path,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in header}),
+    )
+    if 'for_devs' in table.column_names:
+        # Convert for_devs to boolean
+        for_devs = pc.equal(pc.utf8_upper(table['for_devs']), 'TRUE')
+        table = table.set_column(table.column_names.index('for_devs'), 'for_devs', for_devs)
+    return tuple(table.to_pylist())
+
+def _parse_csv_dictreader(path):
+    """Parse a CSV file with the stdlib csv module"""
+    with open(path, 'r', encoding='utf-8') as file:
+        rows = tuple(csv.DictReader(file))
+    if rows and 'for_devs' in rows[0]:
+        # Convert for_devs to boolean
+        for row in rows:
+            row['for_devs'] = row['for_devs'].upper() == 'TRUE'
+    return rows
+
+@lru_cache(maxsize=4)
+def _load_csv_cached(path, mtime_ns, size):
+    """Parse a CSV file once per (path, mtime, size) and return its rows"""
+    rows = _read_pickle_cache(path, mtime_ns, size)
+    if rows is not None:
+        return rows
+    
+    rows = None
+    if pa is not None:
+        try:
+            rows = _parse_csv_pyarrow(path)
+        except pa.ArrowInvalid:
+            # Ragged or malformed rows: let the forgiving stdlib reader handle them
+            rows = None
+    if rows is None:
+        rows = _parse_csv_dictreader(path)
+    _write_pickle_cache(path, size, rows)
+    return rows
+
+def _csv_cache_key(path):
+    """Return the (path, mtime, size) cache key for a CSV file, or None if missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def _load_csv(path):
+    """Return cached CSV rows, re-parsing only when the file changes"""
+    key = _csv_cache_key(path)
+    if key is None:
+        return ()
+    return _load_csv_cached(*key)
+
+def _trigrams(text):
+    """Return the set of overlapping 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+@lru_cache(maxsize=2)
+def _build_prompt_index(path, mtime_ns, size):
+    """Precompute lowercased search columns and the developer subset for prompts"""
+    rows = _load_csv_cached(path, mtime_ns, size)
+    acts_lower = [(row.get('act') or '').lower() for row in rows]
+    prompts_lower = [(row.get('prompt') or '').lower() for row in rows]
+    dev_indices = array('i', [i for i, row in enumerate(rows) if row.get('for_devs')])
+    dev_subset = tuple(rows[i] for i in dev_indices)
+    
+    # Trigram inverted index over act and prompt (indexed separately so no
+    # trigram spans the boundary between the two fields)
+    postings = {}
+    for i, (act, prompt) in enumerate(zip(acts_lower, prompts_lower)):
+        for gram in _trigrams(act) | _trigrams(prompt):
+            postings.setdefault(gram, []).append(i)
+    trigram_index = {gram: frozenset(ids) for gram, ids in postings.items()}
+    
+    # HTTP validators for the API responses derived from this CSV version
+    with open(path, 'rb') as file:
+        etag = hashlib.blake2b(file.read(), digest_size=8).hexdigest()
+    last_modified = datetime.fromtimestamp(mtime_ns // 1_000_000_000, tz=timezone.utc)
+    
+    return {
+        'cache_key': (path, mtime_ns, size),
+        'rows': rows,
+        'acts_lower': acts_lower,
+        'prompts_lower': prompts_lower,
+        'dev_indices': dev_indices,
+        'dev_index_set': frozenset(dev_indices),
+        'dev_subset': dev_subset,
+        'trigram_index': trigram_index,
+        'etag': etag,
+        'last_modified': last_modified,
+    }
+
+_EMPTY_PROMPT_INDEX = {
+    'cache_key': None,
+    'rows': (),
+    'acts_lower': [],
+    'prompts_lower': [],
+    'dev_indices': array('i'),
+    'dev_index_set': frozenset(),
+    'dev_subset': (),
+    'trigram_index': {},
+    'etag': hashlib.blake2b(b'', digest_size=8).hexdigest(),
+    'last_modified': None,
+}
+
+def _prompt_index_for_key(key):
+    """Return the prompt index for a CSV cache key, or the empty index"""
+    if key is None:
+        return _EMPTY_PROMPT_INDEX
+    return _build_prompt_index(*key)
+
+def load_prompt_index():
+    """Load the precomputed prompt search index"""
+    return _prompt_index_for_key(_csv_cache_key('prompts.csv'))
+
+def search_prompt_index(index, query, developers_only=False):
+    """Return prompts whose act or prompt contains the lowercased query"""
+    acts_lower = index['acts_lower']
+    prompts_lower = index['prompts_lower']
+    
+    if len(query) < 3:
+        # Too short for trigram lookup; scan every (developer) prompt
+        candidates = index['dev_indices'] if developers_only else range(len(acts_lower))
+    else:
+        trigram_index = index['trigram_index']
+        postings = [index['dev_index_set']] if developers_only else []
+        for gram in _trigrams(query):
+            ids = trigram_index.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = sorted(postings[0].intersection(*postings[1:]))
+    
+    rows = index['rows']
+    return [
+        rows[i] for i in candidates
+        if query in acts_lower[i] or query in prompts_lower[i]
+    ]
+
+def _is_not_modified(index):
+    """Check the request's conditional headers against the prompt index validators"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(index['etag'])
+    last_modified = index['last_modified']
+    if_modified_since = request.if_modified_since
+    return last_modified is not None and if_modified_since is not None and if_modified_since >= last_modified
+
+def _with_validators(response, index):
+    """Attach the prompt index's ETag, Last-Modified and max-age to a response"""
+    response.set_etag(index['etag'])
+    response.last_modified = index['last_modified']
+    response.cache_control.max_age = 300
+    return response
+
+def _prompt_list_body(filtered_prompts):
+    """Serialize a prompt list API payload to JSON bytes"""
+    return app.json.response({
+        'prompts': filtered_prompts,
+        'total': len(filtered_prompts),
+        'filtered': len(filtered_prompts)
+    }).get_data()
+
+@lru_cache(maxsize=4)
+def _prompts_response_body(index_key, developers_only):
+    """Cached /api/prompts body for one CSV version and audience"""
+    index = _prompt_index_for_key(index_key)
+    return _prompt_list_body(index['dev_subset'] if developers_only else index['rows'])
+
+@lru_cache(maxsize=256)
+def _search_response_body(index_key, query, developers_only):
+    """Cached /api/search body for the most recent queries"""
+    index = _prompt_index_for_key(index_key)
+    if query:
+        filtered_prompts = search_prompt_index(index, query, developers_only)
+    elif developers_only:
+        filtered_prompts = index['dev_subset']
+    else:
+        filtered_prompts = index['rows']
+    return _prompt_list_body(filtered_prompts)
 
 def load_prompts():
     """Load prompts from CSV file"""
-    global prompts_data
-    csv_path = Path('prompts.csv')
-    if csv_path.exists():
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            prompts_data = list(reader)
-            # Convert for_devs to boolean
-            for prompt in prompts_data:
-                prompt['for_devs'] = prompt['for_devs'].upper() == 'TRUE'
-    return prompts_data
+    return _load_csv('prompts.csv')
 
 def load_vibe_prompts():
     """Load vibe prompts from CSV file"""
-    global vibe_prompts_data
-    csv_path = Path('vibeprompts.csv')
-    if csv_path.exists():
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            vibe_prompts_data = list(reader)
-    return vibe_prompts_data
+    return _load_csv('vibeprompts.csv')
+
+# Markdown instances are stateful, so keep one converter per thread
+_markdown_local = threading.local()
 
 def parse_markdown_content(content):
     """Convert markdown content to HTML"""
-    md = markdown.Markdown(extensions=['extra', 'codehilite'])
-    return md.convert(content)
+    md = getattr(_markdown_local, 'converter', None)
+    if md is None:
+        md = _markdown_local.converter = markdown.Markdown(extensions=['extra', 'codehilite'])
+    return md.reset().convert(content)
 
 def append_prompt_to_csv(act, prompt, for_devs=False):
     """Append a new prompt to the CSV file"""
@@ -56,6 +336,51 @@ def append_prompt_to_csv(act, prompt, for_devs=False):
         writer = csv.writer(file)
         writer.writerow([act, prompt, str(for_devs).upper()])
 
+# Responses smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'text/html', 'text/css', 'text/csv', 'text/javascript', 'application/javascript',
+})
+
+@lru_cache(maxsize=32)
+def _compressed_body(body, encoding):
+    """Compress a response body, caching the result for repeated cached bodies"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+@app.after_request
+def compress_response(response):
+    """Gzip/Brotli-encode text responses for clients that accept it"""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    accept_encodings = request.accept_encodings
+    if brotli is not None and accept_encodings['br']:
+        encoding = 'br'
+    elif accept_encodings['gzip']:
+        encoding = 'gzip'
+    else:
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(_compressed_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # Ranges are served from the identity bytes, so don't advertise them on
+    # an encoded body: a resumed transfer would splice two representations
+    response.headers.pop('Accept-Ranges', None)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The encoded bytes differ from the identity representation
+        response.set_etag(etag, weak=True)
+    return response
+
 @app.route('/')
 def index():
     """Main page route"""
@@ -89,44 +414,27 @@ def vibeprompts_csv():
 @app.route('/api/prompts')
 def api_prompts():
     """API endpoint for prompts"""
-    prompts = load_prompts()
-    audience = request.args.get('audience', 'everyone')
+    index = load_prompt_index()
+    if _is_not_modified(index):
+        return _with_validators(Response(status=304), index)
     
-    if audience == 'developers':
-        filtered_prompts = [p for p in prompts if p.get('for_devs', False)]
-    else:
-        filtered_prompts = prompts
+    audience = request.args.get('audience', 'everyone')
+    body = _prompts_response_body(index['cache_key'], audience == 'developers')
     
-    return jsonify({
-        'prompts': filtered_prompts,
-        'total': len(filtered_prompts),
-        'filtered': len(filtered_prompts)
-    })
+    return _with_validators(Response(body, mimetype=app.json.mimetype), index)
 
 @app.route('/api/search')
 def api_search():
     """Search API endpoint"""
+    index = load_prompt_index()
+    if _is_not_modified(index):
+        return _with_validators(Response(status=304), index)
+    
     query = request.args.get('q', '').lower()
     audience = request.args.get('audience', 'everyone')
+    body = _search_response_body(index['cache_key'], query, audience == 'developers')
     
-    prompts = load_prompts()
-    
-    if audience == 'developers':
-        prompts = [p for p in prompts if p.get('for_devs', False)]
-    
-    if query:
-        filtered_prompts = [
-            p for p in prompts 
-            if query in p.get('act', '').lower() or query in p.get('prompt', '').lower()
-        ]
-    else:
-        filtered_prompts = prompts
-    
-    return jsonify({
-        'prompts': filtered_prompts,
-        'total': len(filtered_prompts),
-        'filtered': len(filtered_prompts)
-    })
+    return _with_validators(Response(body, mimetype=app.json.mimetype), index)
 
 @app.route('/api/github-stars')
 def api_github_stars():
@@ -151,12 +459,12 @@ def add_prompt():
         append_prompt_to_csv(act, prompt, for_devs)
         
         # Reload prompts data
-        load_prompts()
+        prompts = load_prompts()
         
         return jsonify({
             'success': True,
             'message': 'Prompt added successfully',
-            'total_prompts': len(prompts_data)
+            'total_prompts': len(prompts)
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -168,24 +476,49 @@ def admin():
                          title="Admin - Add Prompts",
                          subtitle="Add new prompts to the collection")
 
+# Files that should be served from root rather than the static folder
+ROOT_FILES = frozenset({
+    'style.css', 'script.js', 'embed-style.css', 'embed-script.js',
+    'embed-preview-style.css', 'embed-preview-script.js', 'favicon.ico',
+})
+ROOT_FILE_PATHS = {name: os.path.join(app.root_path, name) for name in ROOT_FILES}
+
+@lru_cache(maxsize=len(ROOT_FILES))
+def _load_root_file(path, mtime_ns, size):
+    """Read a root-served file into memory once per (path, mtime, size)"""
+    with open(path, 'rb') as file:
+        body = file.read()
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    last_modified = datetime.fromtimestamp(mtime_ns // 1_000_000_000, tz=timezone.utc)
+    return body, mimetype, etag, last_modified
+
 # Static file routes for non-static folder files
 @app.route('/<path:filename>')
 def static_files(filename):
     """Serve static files that aren't in the static folder"""
-    # List of files that should be served from root
-    root_files = ['style.css', 'script.js', 'embed-style.css', 'embed-script.js', 
-                  'embed-preview-style.css', 'embed-preview-script.js', 'favicon.ico']
-    
-    if filename in root_files:
-        return send_from_directory('.', filename)
+    root_file_path = ROOT_FILE_PATHS.get(filename)
+    if root_file_path is not None:
+        try:
+            stat = os.stat(root_file_path)
+        except FileNotFoundError:
+            abort(404)
+        body, mimetype, etag, last_modified = _load_root_file(root_file_path, stat.st_mtime_ns, stat.st_size)
+        response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
     
     # Try to serve from static folder
     return send_from_directory('static', filename)
 
 if __name__ == '__main__':
-    # Load data on startup
-    load_prompts()
-    load_vibe_prompts()
+    # Load data on startup, reading both CSVs concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for future in [executor.submit(load_prompt_index), executor.submit(load_vibe_prompts)]:
+            future.result()
     
     # Development server
     app.run(debug=True, host='0.0.0.0', port=4001)
@@ -5,20 +5,63 @@ Replaces Jekyll build functionality
 """
 
 import os
+import re
+import sys
+import gzip
+import html
 import shutil
+import http.server
 from pathlib import Path
-from app import app, freezer
 
-def clean_build_directory():
-    """Clean the build directory"""
-    build_dir = Path('_site')
-    if build_dir.exists():
-        shutil.rmtree(build_dir)
-    build_dir.mkdir(exist_ok=True)
+# Output directory for the generated site
+BUILD_DIR = Path('_site')
+
+# Compiled Jinja template bytecode, reused across builds
+JINJA_CACHE_DIR = Path('.jinja_cache')
+
+# Flask url_for('static', ...) URLs, rewritten to relative paths for GitHub Pages
+STATIC_URL_RE = re.compile(r'/static/([^"\']+)')
+
+def relativize_static_urls(text):
+    """Replace Flask static URLs with relative paths, skipping text without any"""
+    if '/static/' not in text:
+        return text
+    return STATIC_URL_RE.sub(r'\1', text)
+
+def clean_build_directory(written):
+    """Remove everything in the build directory that this build didn't write"""
+    # Written files were overwritten in place, so a rebuild of an unchanged
+    # tree unlinks nothing; whatever remains is left over from earlier builds
+    # (deleted sources, pages that failed to render, old .gz/.br copies)
+    with os.scandir(BUILD_DIR) as entries:
+        stale = [entry for entry in entries if entry.name not in written]
+    for entry in stale:
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+def _copy_files(file_paths, build_dir):
+    """Copy file contents into the build directory, skipping missing files
+    
+    Returns the names of the files copied.
+    """
+    # Only contents are copied; GitHub Pages doesn't need copystat metadata
+    copied_names = []
+    for file_path in file_paths:
+        file_name = os.path.basename(file_path)
+        # Attempt the copy directly rather than stat'ing first (no TOCTOU gap)
+        try:
+            shutil.copyfile(file_path, os.path.join(build_dir, file_name))
+        except FileNotFoundError:
+            continue
+        print(f"✓ Copied {file_path}")
+        copied_names.append(file_name)
+    return copied_names
 
 def copy_static_files():
     """Copy static files to build directory"""
-    build_dir = Path('_site')
+    build_dir = BUILD_DIR
     
     # Files to copy
     static_files = [
@@ -27,55 +70,56 @@ def copy_static_files():
         'favicon.ico'
     ]
     
-    for file_path in static_files:
-        if Path(file_path).exists():
-            shutil.copy2(file_path, build_dir)
-            print(f"✓ Copied {file_path}")
+    return _copy_files(static_files, build_dir)
 
 def copy_csv_files():
     """Copy CSV data files to build directory"""
-    build_dir = Path('_site')
+    build_dir = BUILD_DIR
     
     csv_files = ['prompts.csv', 'vibeprompts.csv']
-    for csv_file in csv_files:
-        if Path(csv_file).exists():
-            shutil.copy2(csv_file, build_dir)
-            print(f"✓ Copied {csv_file}")
+    return _copy_files(csv_files, build_dir)
 
 def copy_templates_to_static():
-    """Copy and process templates to static HTML files using Flask's template engine"""
-    build_dir = Path('_site')
+    """Copy and process templates to static HTML files using Flask's template engine
+    
+    Returns the names of the pages written.
+    """
+    build_dir = BUILD_DIR
+    written = []
     
-    # Import Flask app components
-    from app import app, load_prompts, load_vibe_prompts
+    # Import Flask app components (and Jinja, which 'serve' doesn't need)
+    from app import app, load_prompts
+    from jinja2 import FileSystemBytecodeCache
     
-    # Load data
+    # Load data (memoized by app per CSV mtime, backed by the pickle cache)
     prompts = load_prompts()
-    vibe_prompts = load_vibe_prompts()
+    
+    # Persist compiled templates so repeated builds skip parsing and compiling
+    JINJA_CACHE_DIR.mkdir(exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
     
     # Use Flask's template engine to render templates properly
     with app.app_context():
         try:
-            # Create a mock request context for url_for to work
+            # Create a mock request context for url_for to work; both pages share it
             with app.test_request_context():
                 # Import render_template_string after setting up context
-                from flask import render_template
-                
-                # Render index.html with data
-                index_html = render_template('index.html', 
-                                           title="Awesome ChatGPT Prompts",
-                                           subtitle="World's First & Most Famous Prompts Directory",
-                                           prompts=prompts,
-                                           total_prompts=len(prompts))
+                from flask import render_template, stream_template
                 
-                # Post-process to fix static file URLs for GitHub Pages
-                import re
-                # Replace Flask url_for static calls with relative paths
-                index_html = re.sub(r'/static/([^"\']+)', r'\1', index_html)
+                # Stream index.html through the compiled template straight to disk
+                index_chunks = stream_template('index.html',
+                                               title="Awesome ChatGPT Prompts",
+                                               subtitle="World's First & Most Famous Prompts Directory",
+                                               prompts=prompts,
+                                               total_prompts=len(prompts))
                 
-                with open(build_dir / 'index.html', 'w', encoding='utf-8') as f:
-                    f.write(index_html)
+                with open(build_dir / 'index.html', 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    for chunk in index_chunks:
+                        # Post-process to fix static file URLs for GitHub Pages;
+                        # each url_for() result arrives as its own chunk
+                        f.write(relativize_static_urls(chunk))
                 
+                written.append('index.html')
                 print("✓ Generated index.html from templates")
                 
                 # Generate admin.html if it exists
@@ -84,11 +128,12 @@ def copy_templates_to_static():
                                                title="Admin - Add Prompts",
                                                subtitle="Add new prompts to the collection")
                     # Post-process to fix static file URLs
-                    admin_html = re.sub(r'/static/([^"\']+)', r'\1', admin_html)
+                    admin_html = relativize_static_urls(admin_html)
                     
                     with open(build_dir / 'admin.html', 'w', encoding='utf-8') as f:
                         f.write(admin_html)
                     
+                    written.append('admin.html')
                     print("✓ Generated admin.html from templates")
                 except Exception as e:
                     print(f"⚠️ Could not generate admin.html: {e}")
@@ -98,11 +143,13 @@ def copy_templates_to_static():
             # Fallback to simple template processing
             print("🔄 Falling back to simple template processing...")
             _simple_template_fallback(build_dir, prompts)
+            if 'index.html' not in written:
+                written.append('index.html')
+    
+    return written
 
-def _simple_template_fallback(build_dir, prompts):
-    """Simple fallback template processing when Flask rendering fails"""
-    # Create a basic HTML page with the prompts data
-    html_content = f"""<!DOCTYPE html>
+# Fallback page markup, written around the streamed prompt cards
+FALLBACK_PAGE_HEADER = """<!DOCTYPE html>
 <html lang="en-US">
 <head>
     <meta charset="UTF-8">
@@ -132,7 +179,7 @@ def _simple_template_fallback(build_dir, prompts):
                         </div>
                         <div class="prompt-count" id="promptCount">
                             <span class="count-label">All Prompts</span>
-                            <span class="count-number">{len(prompts)}</span>
+                            <span class="count-number">{total_prompts}</span>
                         </div>
                     </div>
                 </div>
@@ -145,21 +192,8 @@ def _simple_template_fallback(build_dir, prompts):
                             <span class="contributor-badge">Contribute Now</span>
                         </a>
                     </div>"""
-    
-    # Add prompt cards
-    for prompt in prompts[:50]:  # Limit to first 50 prompts for simplicity
-        import html
-        prompt_text = prompt.get('prompt', '')[:200]
-        escaped_prompt_html = html.escape(prompt_text)
-        escaped_prompt_attr = html.escape(prompt_text, quote=True)
-        html_content += f"""
-                    <div class="prompt-card">
-                        <div class="prompt-title">{html.escape(prompt.get('act', 'Prompt'))}</div>
-                        <p class="prompt-content">{escaped_prompt_html}...</p>
-                        <button class="copy-button" data-prompt="{escaped_prompt_attr}">Copy</button>
-                    </div>"""
-    
-    html_content += """
+
+FALLBACK_PAGE_FOOTER = """
                 </div>
             </div>
         </div>
@@ -167,24 +201,83 @@ def _simple_template_fallback(build_dir, prompts):
     <script src="script.js"></script>
 </body>
 </html>"""
-    
-    with open(build_dir / 'index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+
+def render_card(prompt):
+    """Render a single prompt card for the fallback page"""
+    text = prompt.get('prompt', '')
+    # html.escape quotes by default, so it's safe for both text and attribute
+    escaped_prompt = html.escape(text)
+    if len(text) > 200:
+        preview = html.escape(text[:200]) + '...'
+    else:
+        preview = escaped_prompt
+    # The card shows a preview, but Copy copies the full prompt
+    return f"""
+                    <div class="prompt-card">
+                        <div class="prompt-title">{html.escape(prompt.get('act', 'Prompt'))}</div>
+                        <p class="prompt-content">{preview}</p>
+                        <button class="copy-button" data-prompt="{escaped_prompt}">Copy</button>
+                    </div>"""
+
+def _simple_template_fallback(build_dir, prompts):
+    """Simple fallback template processing when Flask rendering fails"""
+    # Stream the page to disk card by card instead of building it in memory
+    with open(build_dir / 'index.html', 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(FALLBACK_PAGE_HEADER.format(total_prompts=len(prompts)))
+        for prompt in prompts:
+            f.write(render_card(prompt))
+        f.write(FALLBACK_PAGE_FOOTER)
     print("✓ Generated index.html with fallback method")
 
 def add_nojekyll_file():
     """Add .nojekyll file for GitHub Pages compatibility"""
-    build_dir = Path('_site')
-    with open(build_dir / '.nojekyll', 'w') as f:
-        f.write('')
+    (BUILD_DIR / '.nojekyll').write_bytes(b'')
     print("✓ Added .nojekyll file for GitHub Pages")
+    return ['.nojekyll']
+
+# Built files worth serving precompressed
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.csv', '.json', '.xml', '.txt')
+
+def _load_brotli():
+    """Import brotli on demand; it's optional and only precompression uses it"""
+    try:
+        import brotli
+    except ImportError:  # Optional: only .gz files are written without it
+        return None
+    return brotli
+
+def compress_site_files(names):
+    """Write .gz (and .br when brotli is installed) siblings for text assets
+    
+    Returns the names of the compressed files written.
+    """
+    build_dir = BUILD_DIR
+    brotli = _load_brotli()
+    written = []
+    for name in names:
+        if not name.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        file_path = build_dir / name
+        data = file_path.read_bytes()
+        file_path.with_name(name + '.gz').write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(name + '.gz')
+        if brotli is not None:
+            file_path.with_name(name + '.br').write_bytes(brotli.compress(data, quality=11))
+            written.append(name + '.br')
+    print("✓ Precompressed text assets")
+    return written
 
-def build_site():
+def build_site(precompress=False):
     """Build the static site"""
     print("🚀 Building static site...")
     
-    # Clean build directory
-    clean_build_directory()
+    # Flask is only needed for building; 'serve' stays stdlib-only
+    from app import freezer
+    
+    # Reuse the build directory: files are overwritten in place and anything
+    # this build didn't write is cleaned up at the end
+    BUILD_DIR.mkdir(exist_ok=True)
+    written = set()
     
     try:
         # Try to use Frozen-Flask
@@ -194,24 +287,40 @@ def build_site():
     except Exception as e:
         print(f"⚠️  Frozen-Flask failed: {e}")
         print("🔄 Falling back to manual static generation...")
-        copy_templates_to_static()
+        written.update(copy_templates_to_static())
     
     # Copy additional static files
-    copy_static_files()
-    copy_csv_files()
+    written.update(copy_static_files())
+    written.update(copy_csv_files())
     
     # Add .nojekyll file for GitHub Pages compatibility
-    add_nojekyll_file()
+    written.update(add_nojekyll_file())
+
+    # Precompressed copies, opt-in: only servers with gzip_static/brotli_static
+    # use them (GitHub Pages and 'serve' don't)
+    if precompress:
+        written.update(compress_site_files(sorted(written)))
+    
+    # Clean build directory of stale files
+    clean_build_directory(written)
     
     print("✅ Static site built successfully!")
-    print(f"📁 Output directory: {Path('_site').absolute()}")
+    print(f"📁 Output directory: {BUILD_DIR.absolute()}")
+
+class QuietSiteHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler for the build directory that doesn't log each request"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=str(BUILD_DIR.absolute()), **kwargs)
+    
+    def log_message(self, format, *args):
+        pass
 
 def serve_site():
     """Serve the built site locally"""
-    import http.server
     import socketserver
     
-    build_dir = Path('_site')
+    build_dir = BUILD_DIR
     if not build_dir.exists():
         print("❌ Build directory not found. Run 'python build.py' first.")
         return
@@ -235,21 +344,20 @@ def serve_site():
             print("\n🛑 Server stopped")
 
 if __name__ == '__main__':
-    import sys
-    
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
         if command == 'build':
-            build_site()
+            build_site(precompress='--precompress' in sys.argv[2:])
         elif command == 'serve':
             serve_site()
         elif command == 'dev':
             print("🚀 Starting development server...")
             print("Run 'python app.py' for development mode")
         else:
-            print("Usage: python build.py [build|serve|dev]")
+            print("Usage: python build.py [build [--precompress]|serve|dev]")
             print("  build  - Generate static site")
+            print("           --precompress also writes .gz/.br copies of text assets")
             print("  serve  - Serve built site locally")
             print("  dev    - Show development instructions")
     else:
@@ -8,7 +8,6 @@ import os
 import sys
 import subprocess
 import platform
-from pathlib import Path
 
 def print_banner():
     """Print the project banner"""
@@ -21,37 +20,32 @@ def print_banner():
 def check_python_version():
     """Check if Python version is compatible"""
     version = sys.version_info
-    if version.major < 3 or (version.major == 3 and version.minor < 8):
+    if version < (3, 8):
         print("❌ Python 3.8+ is required!")
         print(f"Current version: {version.major}.{version.minor}.{version.micro}")
         return False
     print(f"✅ Python {version.major}.{version.minor}.{version.micro} detected")
     return True
 
+# Distributions the app needs to run
+REQUIRED_DISTRIBUTIONS = ["Flask", "Frozen-Flask", "Markdown"]
+
 def check_dependencies():
     """Check if required dependencies are installed"""
     print("\n🔍 Checking dependencies...")
     
-    try:
-        import flask
-        print("✅ Flask installed")
-    except ImportError:
-        print("❌ Flask not installed")
-        return False
+    # Imported here, after main() has checked the version: importlib.metadata
+    # is Python 3.8+
+    from importlib.metadata import distribution, PackageNotFoundError
     
-    try:
-        import flask_frozen
-        print("✅ Frozen-Flask installed")
-    except ImportError:
-        print("❌ Frozen-Flask not installed")
-        return False
-    
-    try:
-        import markdown
-        print("✅ Markdown installed")
-    except ImportError:
-        print("❌ Markdown not installed")
-        return False
+    # Read installed package metadata instead of importing the packages
+    for name in REQUIRED_DISTRIBUTIONS:
+        try:
+            distribution(name)
+        except PackageNotFoundError:
+            print(f"❌ {name} not installed")
+            return False
+        print(f"✅ {name} installed")
     
     return True
 
@@ -81,9 +75,20 @@ def check_files():
         "templates/index.html"
     ]
     
+    # Read each directory once instead of stat'ing every file; names are
+    # compared per directory, so path separators don't matter
+    present = {}
+    for directory in {os.path.dirname(file_path) for file_path in required_files}:
+        try:
+            with os.scandir(directory or '.') as entries:
+                present[directory] = {entry.name for entry in entries}
+        except FileNotFoundError:
+            present[directory] = set()
+    
     missing_files = []
     for file_path in required_files:
-        if Path(file_path).exists():
+        directory, name = os.path.split(file_path)
+        if name in present[directory]:
             print(f"✅ {file_path}")
         else:
             print(f"❌ {file_path}")
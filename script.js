@@ -1032,25 +1032,46 @@ function buildPrompt(encodedPrompt) {
   return promptText;
 }
 
+// Show a check mark on a copy button for two seconds
+function showCopiedFeedback(button) {
+  const originalHTML = button.innerHTML;
+  button.innerHTML = `
+      <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+        <polyline points="20 6 9 17 4 12"></polyline>
+      </svg>
+    `;
+  setTimeout(() => {
+    button.innerHTML = originalHTML;
+  }, 2000);
+}
+
 // Existing copy function
 async function copyPrompt(button, encodedPrompt) {
   try {
     const promptText = buildPrompt(encodedPrompt);
     await navigator.clipboard.writeText(promptText);
-    const originalHTML = button.innerHTML;
-    button.innerHTML = `
-      <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-        <polyline points="20 6 9 17 4 12"></polyline>
-      </svg>
-    `;
-    setTimeout(() => {
-      button.innerHTML = originalHTML;
-    }, 2000);
+    showCopiedFeedback(button);
   } catch (err) {
     console.error("Failed to copy text: ", err);
   }
 }
 
+// Copy buttons that carry their prompt in a data-prompt attribute (static
+// fallback page). That page has no language/tone/audience controls, so the
+// prompt is copied as-is rather than through buildPrompt.
+document.addEventListener("click", async (e) => {
+  const button = e.target.closest(".copy-button[data-prompt]");
+  if (!button) {
+    return;
+  }
+  try {
+    await navigator.clipboard.writeText(button.dataset.prompt);
+    showCopiedFeedback(button);
+  } catch (err) {
+    console.error("Failed to copy text: ", err);
+  }
+});
+
 // Function to handle chat button click in modal
 function openModalChat() {
   const modalContent = document.querySelector(".modal-content");